@@ -29,7 +29,8 @@ __all__ = [
     "PowerStatus",
 ]
 
-from dataclasses import dataclass
+import functools
+from dataclasses import dataclass, fields
 
 
 def one_hundred_zeros() -> list[float]:
@@ -37,6 +38,33 @@ def one_hundred_zeros() -> list[float]:
     return [0.0] * 100
 
 
+def _get_public_field_names(data_type: type) -> tuple[str, ...]:
+    """Return the names of the fields of a dataclass that are sent to the
+    client.
+
+    The result is cached per type, since the dataclasses have a fixed set of
+    fields.
+
+    Parameters
+    ----------
+    data_type : `type`
+        The dataclass type.
+
+    Returns
+    -------
+    `tuple` [`str`]
+        The names of the public fields.
+    """
+    # Widen the dataclass type to `type` before calling the cached function;
+    # mypy does not consider the class objects of dataclasses hashable.
+    return _get_field_names(data_type)
+
+
+@functools.cache
+def _get_field_names(data_type: type) -> tuple[str, ...]:
+    return tuple(field.name for field in fields(data_type))
+
+
 @dataclass
 class LoadCell:
     """Dataclass holding load cell value (from M1 hardpoint) data.
@@ -21,9 +21,9 @@
 
 __all__ = ["ATPneumaticsCsc", "run_atpneumatics_simulator"]
 
-import asyncio
 import pathlib
 
+import uvloop
 from lsst.ts import attcpip, salobj
 
 from . import __version__
@@ -176,5 +176,5 @@ class ATPneumaticsCsc(attcpip.AtTcpipCsc):
 
 
 def run_atpneumatics_simulator() -> None:
-    """Run the ATPneumatics CSC simulator."""
-    asyncio.run(ATPneumaticsCsc.amain(index=None))
+    """Run the ATPneumatics CSC simulator on a uvloop event loop."""
+    uvloop.run(ATPneumaticsCsc.amain(index=None))
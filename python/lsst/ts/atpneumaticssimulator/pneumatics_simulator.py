@@ -24,6 +24,8 @@ from __future__ import annotations
 __all__ = ["PneumaticsSimulator"]
 
 import asyncio
+import contextlib
+import json
 import pathlib
 import typing
 
@@ -43,9 +45,42 @@ from .dataclasses import (
     M2AirPressure,
     MainAirSourcePressure,
     PowerStatus,
+    _get_public_field_names,
 )
 from .enums import Command, Event, OpenCloseState, Telemetry
 
+try:
+    import orjson
+
+    def _encode_json(data: typing.Any) -> bytes:
+        return orjson.dumps(data)
+
+except ImportError:
+
+    def _encode_json(data: typing.Any) -> bytes:
+        return json.dumps(data).encode()
+
+
+# orjson only accepts instances of str as keys, not str enums.
+_ID_KEY = attcpip.CommonCommandArgument.ID.value
+_SEQUENCE_ID_KEY = attcpip.CommonCommandArgument.SEQUENCE_ID.value
+
+# Dataclasses holding telemetry data.
+_TelemetryData = LoadCell | M1AirPressure | M2AirPressure | MainAirSourcePressure
+
+# Names of the closed and opened limit switches of the M1 cover petals.
+_M1_COVER_CLOSED_SWITCHES = [f"cover{num}ClosedActive" for num in range(1, 5)]
+_M1_COVER_OPENED_SWITCHES = [f"cover{num}OpenedActive" for num in range(1, 5)]
+
+# Dict of (closed, opened): m1CoverLimitSwitches event data. All cover petals
+# always have the same state, so there only are four possible payloads.
+_M1_COVER_LIMIT_SWITCHES = {
+    (closed, opened): dict.fromkeys(_M1_COVER_CLOSED_SWITCHES, closed)
+    | dict.fromkeys(_M1_COVER_OPENED_SWITCHES, opened)
+    for closed in (False, True)
+    for opened in (False, True)
+}
+
 
 class PneumaticsSimulator(attcpip.AtSimulator):
     """Simulate the ATPneumatics system.
@@ -68,9 +103,30 @@ class PneumaticsSimulator(attcpip.AtSimulator):
         # Interval between telemetry updates [sec].
         self.telemetry_interval = 1.0
 
-        # Task that runs while the telemetry_loop runs.
+        # Unchanged telemetry is sent on every this many telemetry updates.
+        # Changed telemetry is always sent. The default of 1 sends all
+        # telemetry on every update.
+        self.telemetry_heartbeat_updates = 1
+
+        # Dict of telemetry ID: (values last sent, number of updates skipped
+        # since then).
+        self._last_telemetry: dict[Telemetry, tuple[tuple, int]] = dict()
+
+        # Task that runs the telemetry_loop. It is started when a telemetry
+        # client connects for the first time and then keeps running, idling
+        # while no telemetry client is connected.
         self._telemetry_task = utils.make_done_future()
 
+        # Set while a telemetry client is connected.
+        self._telemetry_client_connected = asyncio.Event()
+
+        # Encoded events waiting to be written at the end of `_batch_evts`,
+        # or None if events are written right away.
+        self._pending_evts: list[bytes] | None = None
+
+        # The task that opened the current `_batch_evts` batch, if any.
+        self._batch_evts_task: asyncio.Task | None = None
+
         # Keep track of opening and closing states of the covers and vents.
         self.m1_covers_state = OpenCloseState.CLOSED
         self.m1_vents_state = OpenCloseState.CLOSED
@@ -192,32 +248,40 @@ class PneumaticsSimulator(attcpip.AtSimulator):
         * mainValveState
         * powerStatus
         """
-        self.e_stop = False
-        await self._write_evt(evt_id=Event.ESTOP, triggered=self.e_stop)
-        await self.set_cell_vents_events(closed=True, opened=False)
-        await self.set_m1_cover_events(closed=True, opened=False)
-        self.instrument_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.INSTRUMENTSTATE, state=self.instrument_state)
-        self.m1_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.M1STATE, state=self.m1_state)
-        self.m2_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.M2STATE, state=self.m2_state)
-        self.main_valve_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.MAINVALVESTATE, state=self.main_valve_state)
-        self.power_status.powerOnL1 = True
-        self.power_status.powerOnL2 = True
-        self.power_status.powerOnL3 = True
-        await self._write_evt(
-            evt_id=Event.POWERSTATUS,
-            powerOnL1=self.power_status.powerOnL1,
-            powerOnL2=self.power_status.powerOnL2,
-            powerOnL3=self.power_status.powerOnL3,
-        )
+        async with self._batch_evts():
+            self.e_stop = False
+            await self._write_evt(evt_id=Event.ESTOP, triggered=self.e_stop)
+            await self.set_cell_vents_events(closed=True, opened=False)
+            await self.set_m1_cover_events(closed=True, opened=False)
+            self.instrument_state = AirValveState.OPENED
+            await self._write_evt(
+                evt_id=Event.INSTRUMENTSTATE, state=self.instrument_state
+            )
+            self.m1_state = AirValveState.OPENED
+            await self._write_evt(evt_id=Event.M1STATE, state=self.m1_state)
+            self.m2_state = AirValveState.OPENED
+            await self._write_evt(evt_id=Event.M2STATE, state=self.m2_state)
+            self.main_valve_state = AirValveState.OPENED
+            await self._write_evt(
+                evt_id=Event.MAINVALVESTATE, state=self.main_valve_state
+            )
+            self.power_status.powerOnL1 = True
+            self.power_status.powerOnL2 = True
+            self.power_status.powerOnL3 = True
+            await self._write_evt(
+                evt_id=Event.POWERSTATUS,
+                powerOnL1=self.power_status.powerOnL1,
+                powerOnL2=self.power_status.powerOnL2,
+                powerOnL3=self.power_status.powerOnL3,
+            )
 
     async def do_close_instrument_air_valve(self, sequence_id: int) -> None:
         self.instrument_state = AirValveState.CLOSED
-        await self._write_evt(evt_id=Event.INSTRUMENTSTATE, state=self.instrument_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id,
+            evt_id=Event.INSTRUMENTSTATE,
+            state=self.instrument_state,
+        )
 
     async def do_close_m1_cell_vents(self, sequence_id: int) -> None:
         if self.m1_vents_state not in [OpenCloseState.CLOSING, OpenCloseState.CLOSED]:
@@ -225,9 +289,14 @@ class PneumaticsSimulator(attcpip.AtSimulator):
             if self.m1_vents_position != VentsPosition.CLOSED:
                 await self.set_cell_vents_events(closed=False, opened=False)
                 await asyncio.sleep(self.cell_vents_close_time)
-            await self.set_cell_vents_events(closed=True, opened=False)
-            self.m1_vents_state = OpenCloseState.CLOSED
-        await self.write_success_response(sequence_id=sequence_id)
+            # Write the final events and the SUCCESS response together. Only
+            # await writes in here; see `_batch_evts`.
+            async with self._batch_evts():
+                await self.set_cell_vents_events(closed=True, opened=False)
+                self.m1_vents_state = OpenCloseState.CLOSED
+                await self._write_success(sequence_id=sequence_id)
+        else:
+            await self._write_success(sequence_id=sequence_id)
 
     async def do_close_m1_cover(self, sequence_id: int) -> None:
         if self.m1_covers_state not in [OpenCloseState.CLOSING, OpenCloseState.CLOSED]:
@@ -235,49 +304,70 @@ class PneumaticsSimulator(attcpip.AtSimulator):
             if self.m1_cover_state != MirrorCoverState.CLOSED:
                 await self.set_m1_cover_events(closed=False, opened=False)
                 await asyncio.sleep(self.m1_covers_close_time)
-            await self.set_m1_cover_events(closed=True, opened=False)
-            self.m1_covers_state = OpenCloseState.CLOSED
-        await self.write_success_response(sequence_id=sequence_id)
+            # Write the final events and the SUCCESS response together. Only
+            # await writes in here; see `_batch_evts`.
+            async with self._batch_evts():
+                await self.set_m1_cover_events(closed=True, opened=False)
+                self.m1_covers_state = OpenCloseState.CLOSED
+                await self._write_success(sequence_id=sequence_id)
+        else:
+            await self._write_success(sequence_id=sequence_id)
 
     async def do_close_master_air_supply(self, sequence_id: int) -> None:
         self.main_valve_state = AirValveState.CLOSED
-        await self._write_evt(evt_id=Event.MAINVALVESTATE, state=self.main_valve_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id,
+            evt_id=Event.MAINVALVESTATE,
+            state=self.main_valve_state,
+        )
 
     async def do_m1_close_air_valve(self, sequence_id: int) -> None:
         self.m1_state = AirValveState.CLOSED
-        await self._write_evt(evt_id=Event.M1STATE, state=self.m1_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id, evt_id=Event.M1STATE, state=self.m1_state
+        )
 
     async def do_m1_open_air_valve(self, sequence_id: int) -> None:
         self.m1_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.M1STATE, state=self.m1_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id, evt_id=Event.M1STATE, state=self.m1_state
+        )
 
     async def do_m1_set_pressure(self, sequence_id: int, pressure: float) -> None:
         self.m1_pressure = pressure
-        await self._write_evt(evt_id=Event.M1SETPRESSURE, pressure=self.m1_pressure)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id,
+            evt_id=Event.M1SETPRESSURE,
+            pressure=self.m1_pressure,
+        )
 
     async def do_m2_close_air_valve(self, sequence_id: int) -> None:
         self.m2_state = AirValveState.CLOSED
-        await self._write_evt(evt_id=Event.M2STATE, state=self.m2_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id, evt_id=Event.M2STATE, state=self.m2_state
+        )
 
     async def do_m2_open_air_valve(self, sequence_id: int) -> None:
         self.m2_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.M2STATE, state=self.m2_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id, evt_id=Event.M2STATE, state=self.m2_state
+        )
 
     async def do_m2_set_pressure(self, sequence_id: int, pressure: float) -> None:
         self.m2_pressure = pressure
-        await self._write_evt(evt_id=Event.M2SETPRESSURE, pressure=self.m2_pressure)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id,
+            evt_id=Event.M2SETPRESSURE,
+            pressure=self.m2_pressure,
+        )
 
     async def do_open_instrument_air_valve(self, sequence_id: int) -> None:
         self.instrument_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.INSTRUMENTSTATE, state=self.instrument_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id,
+            evt_id=Event.INSTRUMENTSTATE,
+            state=self.instrument_state,
+        )
 
     async def do_open_m1_cell_vents(self, sequence_id: int) -> None:
         if self.m1_vents_state not in [OpenCloseState.OPENING, OpenCloseState.OPEN]:
@@ -285,9 +375,14 @@ class PneumaticsSimulator(attcpip.AtSimulator):
             if self.m1_vents_position != VentsPosition.OPENED:
                 await self.set_cell_vents_events(closed=False, opened=False)
                 await asyncio.sleep(self.cell_vents_open_time)
-            await self.set_cell_vents_events(closed=False, opened=True)
-            self.m1_vents_state = OpenCloseState.OPEN
-        await self.write_success_response(sequence_id=sequence_id)
+            # Write the final events and the SUCCESS response together. Only
+            # await writes in here; see `_batch_evts`.
+            async with self._batch_evts():
+                await self.set_cell_vents_events(closed=False, opened=True)
+                self.m1_vents_state = OpenCloseState.OPEN
+                await self._write_success(sequence_id=sequence_id)
+        else:
+            await self._write_success(sequence_id=sequence_id)
 
     async def do_open_m1_cover(self, sequence_id: int) -> None:
         if self.m1_covers_state not in [OpenCloseState.OPENING, OpenCloseState.OPEN]:
@@ -295,14 +390,22 @@ class PneumaticsSimulator(attcpip.AtSimulator):
             if self.m1_cover_state != MirrorCoverState.OPENED:
                 await self.set_m1_cover_events(closed=False, opened=False)
                 await asyncio.sleep(self.m1_covers_open_time)
-            await self.set_m1_cover_events(closed=False, opened=True)
-            self.m1_covers_state = OpenCloseState.OPEN
-        await self.write_success_response(sequence_id=sequence_id)
+            # Write the final events and the SUCCESS response together. Only
+            # await writes in here; see `_batch_evts`.
+            async with self._batch_evts():
+                await self.set_m1_cover_events(closed=False, opened=True)
+                self.m1_covers_state = OpenCloseState.OPEN
+                await self._write_success(sequence_id=sequence_id)
+        else:
+            await self._write_success(sequence_id=sequence_id)
 
     async def do_open_master_air_supply(self, sequence_id: int) -> None:
         self.main_valve_state = AirValveState.OPENED
-        await self._write_evt(evt_id=Event.MAINVALVESTATE, state=self.main_valve_state)
-        await self.write_success_response(sequence_id=sequence_id)
+        await self._write_evt_and_success(
+            sequence_id=sequence_id,
+            evt_id=Event.MAINVALVESTATE,
+            state=self.main_valve_state,
+        )
 
     async def cmd_evt_connect_callback(self, server: tcpip.OneClientServer) -> None:
         """Callback function for when a cmd/evt client connects or disconnects.
@@ -312,20 +415,30 @@ class PneumaticsSimulator(attcpip.AtSimulator):
         When the cmd/evt client disconnects, all background tasks get stopped.
         """
         if server.connected:
-            await self.configure()
-            await self.initialize()
+            async with self._batch_evts():
+                await self.configure()
+                await self.initialize()
 
     async def telemetry_connect_callback(self, server: tcpip.OneClientServer) -> None:
         """Callback function for when a tel client connects or disconnects.
 
-        When a tel client connects, the telemetry loop is started.
-        When the tel client disconnects, the telemetry loop is stopped.
+        When a tel client connects, the telemetry loop is started or resumed.
+        When the tel client disconnects, the telemetry loop is paused.
         """
         if server.connected:
+            # Make sure a new client gets all telemetry right away.
+            self._last_telemetry.clear()
+            self._telemetry_client_connected.set()
             if self._telemetry_task.done():
                 self._telemetry_task = asyncio.create_task(self.telemetry_loop())
         else:
-            self._telemetry_task.cancel()
+            self._telemetry_client_connected.clear()
+
+    async def close(self) -> None:
+        """Stop the telemetry loop and close the simulator."""
+        self._telemetry_task.cancel()
+        await asyncio.gather(self._telemetry_task, return_exceptions=True)
+        await super().close()
 
     async def set_cell_vents_events(self, closed: bool, opened: bool) -> None:
         """Set m1VentsLimitSwitches, m1VentsPosition and cellVentsState events.
@@ -339,34 +452,37 @@ class PneumaticsSimulator(attcpip.AtSimulator):
         opened : `bool`
             Are the opened switches active?
         """
-        if not (closed or opened):
-            self.cell_vents_state = CellVentState.INMOTION
+        async with self._batch_evts():
+            if not (closed or opened):
+                self.cell_vents_state = CellVentState.INMOTION
+                await self._write_evt(
+                    evt_id=Event.CELLVENTSTATE, state=self.cell_vents_state
+                )
+
+            self.m1_vents_limit_switches.ventsClosedActive = closed
+            self.m1_vents_limit_switches.ventsOpenedActive = opened
+            await self._write_evt(
+                evt_id=Event.M1VENTSLIMITSWITCHES,
+                ventsClosedActive=self.m1_vents_limit_switches.ventsClosedActive,
+                ventsOpenedActive=self.m1_vents_limit_switches.ventsOpenedActive,
+            )
+            if opened:
+                self.m1_vents_position = VentsPosition.OPENED
+            elif closed:
+                self.m1_vents_position = VentsPosition.CLOSED
+            else:
+                self.m1_vents_position = VentsPosition.PARTIALLYOPENED
+            await self._write_evt(
+                evt_id=Event.M1VENTSPOSITION, position=self.m1_vents_position
+            )
+            if opened:
+                self.cell_vents_state = CellVentState.OPENED
+            elif closed:
+                self.cell_vents_state = CellVentState.CLOSED
             await self._write_evt(
                 evt_id=Event.CELLVENTSTATE, state=self.cell_vents_state
             )
 
-        self.m1_vents_limit_switches.ventsClosedActive = closed
-        self.m1_vents_limit_switches.ventsOpenedActive = opened
-        await self._write_evt(
-            evt_id=Event.M1VENTSLIMITSWITCHES,
-            ventsClosedActive=self.m1_vents_limit_switches.ventsClosedActive,
-            ventsOpenedActive=self.m1_vents_limit_switches.ventsOpenedActive,
-        )
-        if opened:
-            self.m1_vents_position = VentsPosition.OPENED
-        elif closed:
-            self.m1_vents_position = VentsPosition.CLOSED
-        else:
-            self.m1_vents_position = VentsPosition.PARTIALLYOPENED
-        await self._write_evt(
-            evt_id=Event.M1VENTSPOSITION, position=self.m1_vents_position
-        )
-        if opened:
-            self.cell_vents_state = CellVentState.OPENED
-        elif closed:
-            self.cell_vents_state = CellVentState.CLOSED
-        await self._write_evt(evt_id=Event.CELLVENTSTATE, state=self.cell_vents_state)
-
     async def set_m1_cover_events(self, closed: bool, opened: bool) -> None:
         """Set m1CoverLimitSwitches and m1CoverState events.
 
@@ -379,24 +495,20 @@ class PneumaticsSimulator(attcpip.AtSimulator):
         opened : `bool`
             Are the opened switches active?
         """
-        kwargs = dict()
-        for num in range(1, 5):
-            closed_attr_name = f"cover{num}ClosedActive"
-            opened_attr_name = f"cover{num}OpenedActive"
-            setattr(self.m1_cover_limit_switches, closed_attr_name, closed)
-            setattr(self.m1_cover_limit_switches, opened_attr_name, opened)
-            kwargs[closed_attr_name] = closed
-            kwargs[opened_attr_name] = opened
-        await self._write_evt(evt_id=Event.M1COVERLIMITSWITCHES, **kwargs)
-        if opened and closed:
-            self.m1_cover_state = MirrorCoverState.INVALID
-        elif opened:
-            self.m1_cover_state = MirrorCoverState.OPENED
-        elif closed:
-            self.m1_cover_state = MirrorCoverState.CLOSED
-        else:
-            self.m1_cover_state = MirrorCoverState.INMOTION
-        await self._write_evt(evt_id=Event.M1COVERSTATE, state=self.m1_cover_state)
+        async with self._batch_evts():
+            limit_switches = _M1_COVER_LIMIT_SWITCHES[(closed, opened)]
+            for name, value in limit_switches.items():
+                setattr(self.m1_cover_limit_switches, name, value)
+            await self._write_evt(evt_id=Event.M1COVERLIMITSWITCHES, **limit_switches)
+            if opened and closed:
+                self.m1_cover_state = MirrorCoverState.INVALID
+            elif opened:
+                self.m1_cover_state = MirrorCoverState.OPENED
+            elif closed:
+                self.m1_cover_state = MirrorCoverState.CLOSED
+            else:
+                self.m1_cover_state = MirrorCoverState.INMOTION
+            await self._write_evt(evt_id=Event.M1COVERSTATE, state=self.m1_cover_state)
 
     async def telemetry_loop(self) -> None:
         """Output telemetry and events that have changed
@@ -411,10 +523,30 @@ class PneumaticsSimulator(attcpip.AtSimulator):
         * loadCell
 
         See `update_events` for the events that are output.
+
+        Updates are scheduled at absolute times, so the time spent writing
+        the telemetry does not add up to a drift. If the loop falls behind,
+        the next update is output right away instead of in a burst.
+
+        The loop waits while no telemetry client is connected.
         """
+        loop = asyncio.get_running_loop()
+        next_update_time = loop.time()
         while True:
-            await self.update_telemetry()
-            await asyncio.sleep(self.telemetry_interval)
+            if not self._telemetry_client_connected.is_set():
+                await self._telemetry_client_connected.wait()
+                next_update_time = loop.time()
+            try:
+                await self.update_telemetry()
+            except ConnectionError:
+                # The client is gone either way; update_telemetry has logged
+                # the error if the disconnect was not noticed yet. Keep this
+                # single long-lived task running for the next client.
+                pass
+            next_update_time = max(
+                next_update_time + self.telemetry_interval, loop.time()
+            )
+            await asyncio.sleep(next_update_time - loop.time())
 
     async def update_telemetry(self) -> None:
         """Output all telemetry data messages."""
@@ -432,22 +564,195 @@ class PneumaticsSimulator(attcpip.AtSimulator):
             else:
                 self.m2_air_pressure.pressure = 0
 
-            await self._write_telemetry(
-                tel_id=Telemetry.M1_AIR_PRESSURE,
-                data=self.m1_air_pressure,
+            telemetry = self._get_telemetry_to_send(
+                {
+                    Telemetry.M1_AIR_PRESSURE: self.m1_air_pressure,
+                    Telemetry.M2_AIR_PRESSURE: self.m2_air_pressure,
+                    Telemetry.MAIN_AIR_SOURCE_PRESSURE: self.main_air_source_pressure,
+                    Telemetry.LOAD_CELL: self.load_cell,
+                }
             )
-            await self._write_telemetry(
-                tel_id=Telemetry.M2_AIR_PRESSURE,
-                data=self.m2_air_pressure,
-            )
-            await self._write_telemetry(
-                tel_id=Telemetry.MAIN_AIR_SOURCE_PRESSURE,
-                data=self.main_air_source_pressure,
+            if telemetry:
+                await self._write_telemetry_batch(telemetry)
+        except ConnectionError:
+            # Only log if this is not due to the client disconnecting.
+            if self._telemetry_client_connected.is_set():
+                self.log.exception("update_telemetry failed.")
+            raise
+        except Exception:
+            self.log.exception("update_telemetry failed.")
+            raise
+
+    def _get_telemetry_to_send(
+        self, telemetry: dict[Telemetry, _TelemetryData]
+    ) -> dict[Telemetry, _TelemetryData]:
+        """Get the telemetry that has changed or is due to be sent anyway.
+
+        Parameters
+        ----------
+        telemetry : `dict` [`Telemetry`, `_TelemetryData`]
+            Dict of telemetry ID: dataclass holding the telemetry data.
+
+        Returns
+        -------
+        `dict` [`Telemetry`, `_TelemetryData`]
+            The items of ``telemetry`` to send.
+        """
+        if self.telemetry_heartbeat_updates <= 1:
+            return telemetry
+
+        telemetry_to_send: dict[Telemetry, _TelemetryData] = dict()
+        for tel_id, data in telemetry.items():
+            values = tuple(
+                getattr(data, name) for name in _get_public_field_names(type(data))
             )
-            await self._write_telemetry(
-                tel_id=Telemetry.LOAD_CELL,
-                data=self.load_cell,
+            last_values, num_skipped = self._last_telemetry.get(tel_id, (None, 0))
+            if (
+                values == last_values
+                and num_skipped + 1 < self.telemetry_heartbeat_updates
+            ):
+                self._last_telemetry[tel_id] = (values, num_skipped + 1)
+            else:
+                self._last_telemetry[tel_id] = (values, 0)
+                telemetry_to_send[tel_id] = data
+        return telemetry_to_send
+
+    @contextlib.asynccontextmanager
+    async def _batch_evts(self) -> typing.AsyncIterator[None]:
+        """Write all events and command responses output in the context with
+        a single write.
+
+        The messages keep their order. In nested contexts the messages are
+        written when the outermost context exits. If the context raises an
+        exception, the messages output so far are still written before the
+        exception propagates.
+
+        The batch belongs to the task that opened it. Messages output by
+        other tasks while it is open, such as by a concurrent command or by
+        `update_events` in the telemetry task, are written right away, also
+        if those tasks open a context of their own. The context should not
+        await anything but the writes of this class; otherwise such messages
+        overtake the batched ones for longer than necessary.
+        """
+        if self._pending_evts is not None:
+            yield
+            return
+
+        self._pending_evts = []
+        self._batch_evts_task = asyncio.current_task()
+        try:
+            yield
+        finally:
+            data = b"".join(self._pending_evts)
+            self._pending_evts = None
+            self._batch_evts_task = None
+            if data:
+                await self.cmd_evt_server.write(data)
+
+    async def _write_cmd_evt_data(self, data: bytes) -> None:
+        """Write encoded messages to the cmd/evt client.
+
+        If called from the task of the current `_batch_evts` context, the
+        data are written when the context exits.
+
+        Parameters
+        ----------
+        data : `bytes`
+            The encoded messages, each ending with a terminator.
+        """
+        if (
+            self._pending_evts is None
+            or asyncio.current_task() is not self._batch_evts_task
+        ):
+            await self.cmd_evt_server.write(data)
+        else:
+            self._pending_evts.append(data)
+
+    async def _write_evt(self, evt_id: str, **kwargs: typing.Any) -> None:
+        await self._write_cmd_evt_data(
+            _encode_json({_ID_KEY: evt_id} | kwargs) + tcpip.DEFAULT_TERMINATOR
+        )
+
+    async def _write_success(self, sequence_id: int) -> None:
+        """Write the SUCCESS response of a command.
+
+        Unlike `write_success_response`, the response is part of the current
+        `_batch_evts` batch, if any.
+
+        Parameters
+        ----------
+        sequence_id : `int`
+            The sequence ID of the command.
+        """
+        await self._write_cmd_evt_data(
+            _encode_json({_ID_KEY: attcpip.Ack.SUCCESS, _SEQUENCE_ID_KEY: sequence_id})
+            + tcpip.DEFAULT_TERMINATOR
+        )
+
+    async def _write_evt_and_success(
+        self, sequence_id: int, evt_id: str, **kwargs: typing.Any
+    ) -> None:
+        """Write an event followed by the SUCCESS response of a command.
+
+        Both messages are sent with a single write, so the client gets them
+        in one TCP segment instead of two.
+
+        Parameters
+        ----------
+        sequence_id : `int`
+            The sequence ID of the command.
+        evt_id : `str`
+            The event ID.
+        **kwargs : `typing.Any`
+            The event data.
+        """
+        async with self._batch_evts():
+            await self._write_evt(evt_id=evt_id, **kwargs)
+            await self._write_success(sequence_id=sequence_id)
+
+    async def _write_telemetry(self, tel_id: Telemetry, data: typing.Any) -> None:
+        await self._write_telemetry_batch({tel_id: data})
+
+    def _get_telemetry_message(
+        self, tel_id: Telemetry, data: _TelemetryData
+    ) -> dict[str, typing.Any]:
+        """Get the message to send for a telemetry topic.
+
+        Parameters
+        ----------
+        tel_id : `Telemetry`
+            The telemetry ID.
+        data : `_TelemetryData`
+            Dataclass holding the telemetry data.
+
+        Returns
+        -------
+        `dict` [`str`, `typing.Any`]
+            The telemetry message.
+        """
+        message: dict[str, typing.Any] = {_ID_KEY: tel_id}
+        for name in _get_public_field_names(type(data)):
+            message[name] = getattr(data, name)
+        return message
+
+    async def _write_telemetry_batch(
+        self, telemetry: dict[Telemetry, _TelemetryData]
+    ) -> None:
+        """Write several telemetry messages with a single write and drain.
+
+        The messages are sent in the order of the dict, one JSON message per
+        line, so the client reads them exactly as if they had been written
+        one by one.
+
+        Parameters
+        ----------
+        telemetry : `dict` [`Telemetry`, `_TelemetryData`]
+            Dict of telemetry ID: dataclass holding the telemetry data.
+        """
+        await self.telemetry_server.write(
+            b"".join(
+                _encode_json(self._get_telemetry_message(tel_id, data))
+                + tcpip.DEFAULT_TERMINATOR
+                for tel_id, data in telemetry.items()
             )
-        except Exception as e:
-            print(f"update_telemetry failed: {e}")
-            raise
+        )
@@ -34,6 +34,10 @@ NODATA_TIMEOUT = 0.1  # timeout when no data expected (sec)
 
 CONFIG_DIR = pathlib.Path(__file__).parent / "data" / "config"
 
+# Fields of the m1CoverLimitSwitches event for the four cover petals.
+M1_COVER_CLOSED_SWITCHES = tuple(f"cover{num}ClosedActive" for num in range(1, 5))
+M1_COVER_OPENED_SWITCHES = tuple(f"cover{num}OpenedActive" for num in range(1, 5))
+
 
 class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
     def basic_make_csc(
@@ -50,6 +54,39 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             override=override,
         )
 
+    async def assert_next_m1_cover_limit_switches(
+        self, closed: bool, opened: bool
+    ) -> None:
+        """Assert that the next m1CoverLimitSwitches event has the given
+        switch states for all cover petals.
+
+        Parameters
+        ----------
+        closed : `bool`
+            Expected state of the closed switches.
+        opened : `bool`
+            Expected state of the opened switches.
+        """
+        await self.assert_next_sample(
+            self.remote.evt_m1CoverLimitSwitches,
+            **dict.fromkeys(M1_COVER_CLOSED_SWITCHES, closed),
+            **dict.fromkeys(M1_COVER_OPENED_SWITCHES, opened),
+        )
+
+    async def assert_no_next_sample(self, topic: salobj.topics.ReadTopic) -> None:
+        """Assert that no new sample of an event arrives.
+
+        Call this after awaiting the command that should not output the
+        event; any sample it did output is already on its way by then.
+
+        Parameters
+        ----------
+        topic : `salobj.topics.ReadTopic`
+            The event topic to check.
+        """
+        with pytest.raises(asyncio.TimeoutError):
+            await topic.next(flush=False, timeout=NODATA_TIMEOUT)
+
     async def test_bin_script(self) -> None:
         """Test that run_atdometrajectory runs the CSC."""
         await self.check_bin_script(
@@ -100,57 +137,52 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
         async with self.make_csc(
             initial_state=salobj.State.ENABLED, config_dir=CONFIG_DIR
         ):
-            await self.assert_next_sample(
-                self.remote.evt_instrumentState, state=ATPneumatics.AirValveState.OPENED
-            )
-            await self.assert_next_sample(
-                self.remote.evt_mainValveState, state=ATPneumatics.AirValveState.OPENED
-            )
-            await self.assert_next_sample(
-                self.remote.evt_m1State, state=ATPneumatics.AirValveState.OPENED
-            )
-            await self.assert_next_sample(
-                self.remote.evt_m2State, state=ATPneumatics.AirValveState.OPENED
-            )
-
-            await self.remote.cmd_closeInstrumentAirValve.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_instrumentState, state=ATPneumatics.AirValveState.CLOSED
-            )
-
-            await self.remote.cmd_closeMasterAirSupply.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_mainValveState, state=ATPneumatics.AirValveState.CLOSED
-            )
-
-            await self.remote.cmd_m1CloseAirValve.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_m1State, state=ATPneumatics.AirValveState.CLOSED
-            )
-
-            await self.remote.cmd_m2CloseAirValve.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_m2State, state=ATPneumatics.AirValveState.CLOSED
-            )
-
-            await self.remote.cmd_openInstrumentAirValve.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_instrumentState, state=ATPneumatics.AirValveState.OPENED
-            )
-
-            await self.remote.cmd_openMasterAirSupply.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_mainValveState, state=ATPneumatics.AirValveState.OPENED
-            )
-
-            await self.remote.cmd_m1OpenAirValve.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_m1State, state=ATPneumatics.AirValveState.OPENED
-            )
-
-            await self.remote.cmd_m2OpenAirValve.start(timeout=STD_TIMEOUT)
-            await self.assert_next_sample(
-                self.remote.evt_m2State, state=ATPneumatics.AirValveState.OPENED
+            # The valves are independent, so check their events together.
+            valve_events = (
+                self.remote.evt_instrumentState,
+                self.remote.evt_mainValveState,
+                self.remote.evt_m1State,
+                self.remote.evt_m2State,
+            )
+            await asyncio.gather(
+                *[
+                    self.assert_next_sample(
+                        event, state=ATPneumatics.AirValveState.OPENED
+                    )
+                    for event in valve_events
+                ]
+            )
+
+            for command in (
+                self.remote.cmd_closeInstrumentAirValve,
+                self.remote.cmd_closeMasterAirSupply,
+                self.remote.cmd_m1CloseAirValve,
+                self.remote.cmd_m2CloseAirValve,
+            ):
+                await command.start(timeout=STD_TIMEOUT)
+            await asyncio.gather(
+                *[
+                    self.assert_next_sample(
+                        event, state=ATPneumatics.AirValveState.CLOSED
+                    )
+                    for event in valve_events
+                ]
+            )
+
+            for command in (
+                self.remote.cmd_openInstrumentAirValve,
+                self.remote.cmd_openMasterAirSupply,
+                self.remote.cmd_m1OpenAirValve,
+                self.remote.cmd_m2OpenAirValve,
+            ):
+                await command.start(timeout=STD_TIMEOUT)
+            await asyncio.gather(
+                *[
+                    self.assert_next_sample(
+                        event, state=ATPneumatics.AirValveState.OPENED
+                    )
+                    for event in valve_events
+                ]
             )
 
     async def test_cell_vents(self) -> None:
@@ -214,10 +246,7 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
 
             # sending open again has no effect
             await self.remote.cmd_openM1CellVents.start(timeout=STD_TIMEOUT)
-            with pytest.raises(asyncio.TimeoutError):
-                await self.remote.evt_cellVentsState.next(
-                    flush=False, timeout=NODATA_TIMEOUT
-                )
+            await self.assert_no_next_sample(self.remote.evt_cellVentsState)
 
             await self.remote.cmd_closeM1CellVents.start(timeout=STD_TIMEOUT)
 
@@ -256,10 +285,7 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
 
             # sending close again has no effect
             await self.remote.cmd_closeM1CellVents.start(timeout=STD_TIMEOUT)
-            with pytest.raises(asyncio.TimeoutError):
-                await self.remote.evt_cellVentsState.next(
-                    flush=False, timeout=NODATA_TIMEOUT
-                )
+            await self.assert_no_next_sample(self.remote.evt_cellVentsState)
 
     async def test_mirror_covers(self) -> None:
         desired_close_time = 0.4  # sec
@@ -275,17 +301,7 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
             await self.assert_next_sample(
                 self.remote.evt_m1CoverState, state=ATPneumatics.MirrorCoverState.CLOSED
             )
-            await self.assert_next_sample(
-                self.remote.evt_m1CoverLimitSwitches,
-                cover1ClosedActive=True,
-                cover2ClosedActive=True,
-                cover3ClosedActive=True,
-                cover4ClosedActive=True,
-                cover1OpenedActive=False,
-                cover2OpenedActive=False,
-                cover3OpenedActive=False,
-                cover4OpenedActive=False,
-            )
+            await self.assert_next_m1_cover_limit_switches(closed=True, opened=False)
 
             await self.remote.cmd_openM1Cover.start(timeout=STD_TIMEOUT)
 
@@ -293,17 +309,7 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 self.remote.evt_m1CoverState,
                 state=ATPneumatics.MirrorCoverState.INMOTION,
             )
-            await self.assert_next_sample(
-                self.remote.evt_m1CoverLimitSwitches,
-                cover1ClosedActive=False,
-                cover2ClosedActive=False,
-                cover3ClosedActive=False,
-                cover4ClosedActive=False,
-                cover1OpenedActive=False,
-                cover2OpenedActive=False,
-                cover3OpenedActive=False,
-                cover4OpenedActive=False,
-            )
+            await self.assert_next_m1_cover_limit_switches(closed=False, opened=False)
 
             # sending open again is acceptable but has no effect
             # on the events output
@@ -314,24 +320,11 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 state=ATPneumatics.MirrorCoverState.OPENED,
                 timeout=desired_open_time + STD_TIMEOUT,
             )
-            await self.assert_next_sample(
-                self.remote.evt_m1CoverLimitSwitches,
-                cover1ClosedActive=False,
-                cover2ClosedActive=False,
-                cover3ClosedActive=False,
-                cover4ClosedActive=False,
-                cover1OpenedActive=True,
-                cover2OpenedActive=True,
-                cover3OpenedActive=True,
-                cover4OpenedActive=True,
-            )
+            await self.assert_next_m1_cover_limit_switches(closed=False, opened=True)
 
             # sending open again has no effect
             await self.remote.cmd_openM1Cover.start(timeout=STD_TIMEOUT)
-            with pytest.raises(asyncio.TimeoutError):
-                await self.remote.evt_m1CoverState.next(
-                    flush=False, timeout=NODATA_TIMEOUT
-                )
+            await self.assert_no_next_sample(self.remote.evt_m1CoverState)
 
             await self.remote.cmd_closeM1Cover.start(timeout=STD_TIMEOUT)
 
@@ -339,17 +332,7 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 self.remote.evt_m1CoverState,
                 state=ATPneumatics.MirrorCoverState.INMOTION,
             )
-            await self.assert_next_sample(
-                self.remote.evt_m1CoverLimitSwitches,
-                cover1ClosedActive=False,
-                cover2ClosedActive=False,
-                cover3ClosedActive=False,
-                cover4ClosedActive=False,
-                cover1OpenedActive=False,
-                cover2OpenedActive=False,
-                cover3OpenedActive=False,
-                cover4OpenedActive=False,
-            )
+            await self.assert_next_m1_cover_limit_switches(closed=False, opened=False)
 
             # sending close again is acceptable but has no effect
             # on the events output
@@ -360,31 +343,18 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 state=ATPneumatics.MirrorCoverState.CLOSED,
                 timeout=desired_close_time + STD_TIMEOUT,
             )
-            await self.assert_next_sample(
-                self.remote.evt_m1CoverLimitSwitches,
-                cover1ClosedActive=True,
-                cover2ClosedActive=True,
-                cover3ClosedActive=True,
-                cover4ClosedActive=True,
-                cover1OpenedActive=False,
-                cover2OpenedActive=False,
-                cover3OpenedActive=False,
-                cover4OpenedActive=False,
-            )
+            await self.assert_next_m1_cover_limit_switches(closed=True, opened=False)
 
             # sending close again has no effect
             await self.remote.cmd_closeM1Cover.start(timeout=STD_TIMEOUT)
-            with pytest.raises(asyncio.TimeoutError):
-                await self.remote.evt_m1CoverState.next(
-                    flush=False, timeout=NODATA_TIMEOUT
-                )
+            await self.assert_no_next_sample(self.remote.evt_m1CoverState)
 
     async def test_set_pressure(self) -> None:
         async with self.make_csc(
             initial_state=salobj.State.ENABLED, config_dir=CONFIG_DIR
         ):
             # output telemetry often so we don't have to wait
-            self.csc.telemetry_interval = 0.1
+            self.csc.simulator.telemetry_interval = 0.1
             init_m1_pressure = 5
             init_m2_pressure = 6
             await self.csc.simulator.configure(
@@ -392,13 +362,11 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 m2_pressure=init_m2_pressure,
             )
 
-            m1data = await self.remote.tel_m1AirPressure.next(
-                flush=True, timeout=STD_TIMEOUT
+            m1data, m2data = await asyncio.gather(
+                self.remote.tel_m1AirPressure.next(flush=True, timeout=STD_TIMEOUT),
+                self.remote.tel_m2AirPressure.next(flush=True, timeout=STD_TIMEOUT),
             )
             assert m1data.pressure == pytest.approx(init_m1_pressure)
-            m2data = await self.remote.tel_m2AirPressure.next(
-                flush=True, timeout=STD_TIMEOUT
-            )
             assert m2data.pressure == pytest.approx(init_m2_pressure)
 
             cmd_m1pressure = 35
@@ -411,13 +379,11 @@ class CscTestCase(salobj.BaseCscTestCase, unittest.IsolatedAsyncioTestCase):
                 pressure=cmd_m2pressure, timeout=STD_TIMEOUT
             )
 
-            m1data = await self.remote.tel_m1AirPressure.next(
-                flush=True, timeout=STD_TIMEOUT
+            m1data, m2data = await asyncio.gather(
+                self.remote.tel_m1AirPressure.next(flush=True, timeout=STD_TIMEOUT),
+                self.remote.tel_m2AirPressure.next(flush=True, timeout=STD_TIMEOUT),
             )
             assert m1data.pressure == pytest.approx(cmd_m1pressure)
-            m2data = await self.remote.tel_m2AirPressure.next(
-                flush=True, timeout=STD_TIMEOUT
-            )
             assert m2data.pressure == pytest.approx(cmd_m2pressure)
 
     async def test_standard_state_transitions(self) -> None:
@@ -21,6 +21,7 @@
 
 import asyncio
 import contextlib
+import functools
 import logging
 import typing
 import unittest
@@ -34,6 +35,35 @@ TIMEOUT = 2
 
 EVENTS_TO_EXPECT = set(atpneumaticssimulator.Event)
 
+# Dict of event ID: name of the JSON schema of the event in the registry.
+EVENT_SCHEMA_NAMES = {
+    event.value: f"logevent_{event.value.removeprefix('evt_')}"
+    for event in atpneumaticssimulator.Event
+}
+
+
+@functools.cache
+def get_validator(schema_name: str) -> jsonschema.protocols.Validator:
+    """Get a validator for a JSON schema in the registry.
+
+    The schema is checked and the validator is created only once per schema.
+    No format checker is used, as with `jsonschema.validate`.
+
+    Parameters
+    ----------
+    schema_name : `str`
+        The name of the schema in the registry.
+
+    Returns
+    -------
+    `jsonschema.protocols.Validator`
+        The validator.
+    """
+    json_schema = attcpip.registry[schema_name]
+    validator_class = jsonschema.validators.validator_for(json_schema)
+    validator_class.check_schema(json_schema)
+    return validator_class(json_schema)
+
 
 class PneumaticsSimulatorTestCase(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self) -> None:
@@ -102,10 +132,10 @@ class PneumaticsSimulatorTestCase(unittest.IsolatedAsyncioTestCase):
             # No need for asserts here. If the data id is not present in
             # registry or the validation of the schema fails, the test will
             # fail as well.
-            json_schema = attcpip.registry[
-                f"logevent_{data[attcpip.CommonCommandArgument.ID].removeprefix('evt_')}"
-            ]
-            jsonschema.validate(data, json_schema)
+            validator = get_validator(
+                EVENT_SCHEMA_NAMES[data[attcpip.CommonCommandArgument.ID]]
+            )
+            validator.validate(data)
 
     async def verify_command_response(
         self,
@@ -628,6 +658,34 @@ class PneumaticsSimulatorTestCase(unittest.IsolatedAsyncioTestCase):
                 sequence_id=sequence_id,
             )
 
+    async def test_batch_evts(self) -> None:
+        async with (
+            self.create_pneumatics_simulator(go_to_fault_state=False) as simulator,
+            self.create_cmd_evt_client(simulator) as cmd_evt_client,
+        ):
+            with self.assertRaises(RuntimeError):
+                async with simulator._batch_evts():
+                    await simulator._write_evt(
+                        evt_id=atpneumaticssimulator.Event.M1STATE,
+                        state=simulator.m1_state,
+                    )
+                    # Events of other tasks are not part of the batch.
+                    await asyncio.create_task(
+                        simulator._write_evt(
+                            evt_id=atpneumaticssimulator.Event.M2STATE,
+                            state=simulator.m2_state,
+                        )
+                    )
+                    raise RuntimeError("Failed.")
+
+            # The batched event still is written after the exception.
+            await self.verify_event(
+                client=cmd_evt_client, evt_name=atpneumaticssimulator.Event.M2STATE
+            )
+            await self.verify_event(
+                client=cmd_evt_client, evt_name=atpneumaticssimulator.Event.M1STATE
+            )
+
     async def test_update_telemetry(self) -> None:
         async with (
             self.create_pneumatics_simulator(go_to_fault_state=False) as simulator,
@@ -642,8 +700,53 @@ class PneumaticsSimulatorTestCase(unittest.IsolatedAsyncioTestCase):
                 # No need for asserts here. If the data id is not present in
                 # registry or the validation of the schema fails, the test will
                 # fail as well.
-                json_schema = attcpip.registry[f"{data['id']}"]
-                jsonschema.validate(data, json_schema)
+                validator = get_validator(data["id"])
+                validator.validate(data)
+
+    async def test_close_stops_telemetry_loop(self) -> None:
+        async with self.create_pneumatics_simulator(
+            go_to_fault_state=False
+        ) as simulator:
+            simulator.telemetry_interval = 0.1
+            async with self.create_telemetry_client(simulator) as telemetry_client:
+                await telemetry_client.read_json()
+                assert not simulator._telemetry_task.done()
+
+            async def wait_disconnected() -> None:
+                while simulator.telemetry_server.connected:
+                    await asyncio.sleep(0.01)
+
+            await asyncio.wait_for(wait_disconnected(), timeout=TIMEOUT)
+            await asyncio.sleep(simulator.telemetry_interval * 2)
+
+            # The telemetry loop keeps running while no client is connected.
+            assert not simulator._telemetry_task.done()
+            assert not simulator._telemetry_client_connected.is_set()
+
+        assert simulator._telemetry_task.done()
+
+    async def test_telemetry_heartbeat(self) -> None:
+        async with self.create_pneumatics_simulator(
+            go_to_fault_state=False
+        ) as simulator:
+            telemetry = {atpneumaticssimulator.Telemetry.LOAD_CELL: simulator.load_cell}
+
+            # By default all telemetry is sent without any bookkeeping.
+            for _ in range(3):
+                assert simulator._get_telemetry_to_send(telemetry) == telemetry
+            assert not simulator._last_telemetry
+
+            simulator.telemetry_heartbeat_updates = 3
+
+            # Unchanged telemetry only gets sent on every third update.
+            telemetry_sent = [
+                bool(simulator._get_telemetry_to_send(telemetry)) for _ in range(6)
+            ]
+            assert telemetry_sent == [True, False, False, True, False, False]
+
+            # Changed telemetry always gets sent.
+            simulator.load_cell.cellLoad += 1.0
+            assert simulator._get_telemetry_to_send(telemetry) == telemetry
 
     async def test_stimulator_state_commands(self) -> None:
         async with (